@@ -1,10 +1,61 @@
+import atexit
+import base64
 import json
 import os
+import sys
 from datetime import datetime, timedelta
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+# one parser reused for every load, as simdjson recommends
+simdjson_parser = simdjson.Parser() if simdjson is not None else None
+
+
+def dumps(obj):
+    # orjson writes datetimes natively; stdlib json needs a hook for them
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, default=datetime.isoformat).encode()
+
+
+loads = orjson.loads if orjson is not None else json.loads
+
+
+def pack_bits(flags):
+    # bullet done flags -> base64 bitmask, bullet i is bit i
+    bits = 0
+    for i, flag in enumerate(flags):
+        if flag:
+            bits |= 1 << i
+    raw = bits.to_bytes((len(flags) + 7) // 8, "little")
+    return base64.b64encode(raw).decode()
+
+
+def unpack_bits(packed, count):
+    bits = int.from_bytes(base64.b64decode(packed), "little")
+    return bytearray((bits >> i) & 1 for i in range(count))
+
 # ------------------------ Save input helpers -------------------------------
 
 
+def read_line(prompt):
+    # lighter input() for prompts asked in a loop
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.rstrip("\n")
+
+
 def safe_int(prompt):
     while True:
         try:
@@ -16,7 +67,11 @@ def safe_int(prompt):
 def safe_datetime(prompt):
     while True:
         try:
-            return datetime.strptime(input(prompt), "%Y-%m-%d %H:%M")
+            dt = datetime.fromisoformat(input(prompt))
+            # tasks are compared against naive datetime.now()
+            if dt.tzinfo is not None:
+                raise ValueError("timezone-aware date")
+            return dt
         except ValueError:
             print("invalid date format. use YYYY-MM-DD HH:MM")
 
@@ -32,25 +87,50 @@ def safe_priority(prompt):
 
 
 class Task:
-    def __init__(self, id, title, description, expiry_date, priority, bullets):
+    __slots__ = ("id", "title", "description", "expiry_date", "priority",
+                 "bullet_texts", "bullet_done", "status", "created_date",
+                 "_title_lc", "_desc_lc", "_status_dirty")
+
+    def __init__(self, id, title, description, expiry_date, priority,
+                 bullet_texts, bullet_done=None, created_date=None):
         self.id = id
         self.title = title
         self.description = description
+        self._title_lc = title.lower()
+        self._desc_lc = description.lower()
         self.expiry_date = expiry_date
         self.priority = priority
-        self.bullets = bullets
+        self.bullet_texts = bullet_texts
+        # one byte per bullet, 1 = done
+        if bullet_done is None:
+            bullet_done = bytearray(len(bullet_texts))
+        self.bullet_done = bullet_done
+        if created_date is None:
+            created_date = datetime.now()
+        self.created_date = created_date
         self.status = "not started"
+        self._status_dirty = True
+
+    def is_expired(self, now=None):
+        if now is None:
+            now = datetime.now()
+        return now > self.expiry_date
+
+    def is_deletable(self, now=None):
+        if now is None:
+            now = datetime.now()
+        return now > self.expiry_date + timedelta(minutes=5)
+
+    def update_status(self, now=None):
+        is_expired = self.is_expired(now)
+        # cached status stays valid until a bullet/edit marks it dirty
+        # or the expiry moment passes
+        if not self._status_dirty and (self.status == "expired") == is_expired:
+            return
 
-    def is_expired(self):
-        return datetime.now() > self.expiry_date
-
-    def is_deletable(self):
-        return datetime.now() > self.expiry_date + timedelta(minutes=5)
-
-    def update_status(self):
-        is_expired = self.is_expired()
-        all_done = all(b["done"] for b in self.bullets)
-        any_done = any(["done"] for b in self.bullets)
+        # a task without bullets has nothing done yet
+        all_done = bool(self.bullet_done) and all(self.bullet_done)
+        any_done = any(self.bullet_done)
 
         match (is_expired, all_done, any_done):
             case (True, _, _):
@@ -61,6 +141,7 @@ class Task:
                 self.status = "in progress..."
             case (False, False, False):
                 self.status = "not started"
+        self._status_dirty = False
 
     def lock_check(self):
         return self.status in ["completed", "expired"]
@@ -72,25 +153,46 @@ class TaskManager:
     FILE = "tasks.json"
 
     def __init__(self):
+        self._dirty = False
+        self._last_buf = None
         self.tasks = self.load() or []
         self.remove_duplicates()
-        self.save
+        self._next_id = max((t.id for t in self.tasks), default=0) + 1
+        self.reindex()
+        self.update_next_expiry()
+        # only rewrite tasks.json if loading changed what it holds
+        self.flush()
 
     def load(self):
         if not os.path.exists(self.FILE):
             return []
 
-        with open(self.FILE, "r") as f:
+        with open(self.FILE, "rb") as f:
             content = f.read().strip()
             if not content:
                 return []
 
-            data = json.loads(content)
+        self._last_buf = content
+        if simdjson_parser is not None:
+            # lazy document; from_dict only materializes the records it keeps
+            data = simdjson_parser.parse(content)
+        else:
+            data = loads(content)
         return self.from_dict(data)
 
     def save(self):
-        with open(self.FILE, "w") as f:
-            json.dump(self.to_dict(), f)
+        buf = dumps(self.to_dict())
+        if buf == self._last_buf:
+            self._dirty = False
+            return
+        with open(self.FILE, "wb") as f:
+            f.write(buf)
+        self._last_buf = buf
+        self._dirty = False
+
+    def flush(self):
+        if self._dirty:
+            self.save()
 
     def to_dict(self):
         return [
@@ -98,59 +200,90 @@ class TaskManager:
                 "id": t.id,
                 "title": t.title,
                 "description": t.description,
-                "created_date": getattr(t, "created_date", datetime.now()).isoformat(),
-                "expiry_date": t.expiry_date.isoformat(),
+                "created_date": t.created_date,
+                "expiry_date": t.expiry_date,
                 "priority": t.priority,
                 "status": t.status,
-                "bullets": t.bullets,
+                "v": 2,
+                "bullet_texts": t.bullet_texts,
+                "bullet_done": pack_bits(t.bullet_done),
 
             }
             for t in self.tasks
         ]
 
     def from_dict(self, data):
+        # defaults and lookups resolved once per load, not per record
+        fromiso = datetime.fromisoformat
+        now = datetime.now()
+        now_iso = now.isoformat()
+        # records cleanup() would drop are skipped before any parsing;
+        # isoformat() strings compare chronologically, other layouts
+        # (e.g. a space separator) are parsed and checked instead
+        threshold = (now - timedelta(minutes=5)).isoformat()
         tasks = []
         for d in data:
-            task = []
-            for d in data:
-                task = Task(
-                    d.get("id", 0),
-                    d.get("title", "Untitleed"),
-                    d.get("description", "no description"),
-                    datetime.fromisoformat(
-                        d.get("expiry_date", datetime.now().isoformat())),
-                    d.get("priority", "low"),
-                    d.get("bullets", []),
-                )
-                task.created_date = datetime.fromisoformat(
-                    d.get("created_date", datetime.now().isoformat()))
-                task.status = d.get("status", "not started")
-                tasks.append(task)
+            expiry_iso = d.get("expiry_date", now_iso)
+            if expiry_iso[10:11] == "T" and expiry_iso < threshold:
+                self._dirty = True
+                continue
+            if d.get("v") == 2:
+                bullet_texts = list(d.get("bullet_texts", []))
+                bullet_done = unpack_bits(
+                    d.get("bullet_done", ""), len(bullet_texts))
+            else:
+                # legacy layout, rewritten as v2 on the next save
+                self._dirty = True
+                bullets = d.get("bullets", [])
+                bullet_texts = [b["text"] for b in bullets]
+                bullet_done = bytearray(bool(b["done"]) for b in bullets)
+            task = Task(
+                d.get("id", 0),
+                d.get("title", "Untitleed"),
+                d.get("description", "no description"),
+                fromiso(expiry_iso),
+                d.get("priority", "low"),
+                bullet_texts,
+                bullet_done,
+                fromiso(d.get("created_date", now_iso)),
+            )
+            if task.is_deletable(now):
+                self._dirty = True
+                continue
+            task.status = d.get("status", "not started")
+            tasks.append(task)
         return tasks
 
+    def reindex(self):
+        self.by_id = {t.id: t for t in self.tasks}
+
+    def update_next_expiry(self):
+        # earliest moment cleanup() can have anything to delete
+        soonest = min((t.expiry_date for t in self.tasks), default=None)
+        if soonest is None:
+            self._next_expiry = None
+        else:
+            self._next_expiry = soonest + timedelta(minutes=5)
+
     def remove_duplicates(self):
-        unique_tasks = []
-        duplicates_count = 0
-        seen_tasks = set()
+        # dicts keep insertion order, so the first copy of each task wins
+        unique_tasks = {}
         for t in self.tasks:
             task_hash = (t.title.strip().lower(),
                          t.description.strip().lower(), t.expiry_date)
-            if task_hash not in seen_tasks:
-                unique_tasks.append(t)
-                seen_tasks.add(task_hash)
-            else:
-                duplicates_count += 1
+            unique_tasks.setdefault(task_hash, t)
+        duplicates_count = len(self.tasks) - len(unique_tasks)
         if duplicates_count:
             print(f"Remove {duplicates_count} duplicate tasks")
-        self.tasks = unique_tasks
+            self._dirty = True
+        self.tasks = list(unique_tasks.values())
 
 
 # ------------------- Helper ---------------
 def get_next_id(manager):
-    if not manager.tasks:
-        return 1
-
-    return max((task.id for task in manager.tasks), default=0) + 1
+    task_id = manager._next_id
+    manager._next_id += 1
+    return task_id
 
 
 # ---------------- Task Function ---------------
@@ -159,49 +292,51 @@ def add_task(manager):
     desc = input("description: ")
     priority = input("priority (Low / Medium / High): ")
 
-    expiry = datetime.strptime(
-        input("Expiry (YYYY-MM-DD HH:MM): "), "%Y-%m-%d %H:%M"
-    )
-    bullets = []
+    expiry = safe_datetime("Expiry (YYYY-MM-DD HH:MM): ")
+    bullet_texts = []
     while True:
-        text = input("Bullet (Enter to stop): ")
+        text = read_line("Bullet (Enter to stop): ")
         if not text:
             break
-        bullets.append({"text": text, "done": False})
-        task_id = get_next_id(manager)
-        task = Task(task_id, title, desc, expiry, priority, bullets)
-        manager.tasks.append(task)
-        manager.save
-        print("Task added.")
+        bullet_texts.append(text)
+
+    task_id = get_next_id(manager)
+    task = Task(task_id, title, desc, expiry, priority, bullet_texts)
+    manager.tasks.append(task)
+    manager.by_id[task.id] = task
+    manager.update_next_expiry()
+    manager._dirty = True
+    print("Task added.")
 
 # ----------------------- edit task -------------------------------
 
 
 def edit_task(manager):
     task_id = int(input("Task ID: "))
-    found = False
+    task = manager.by_id.get(task_id)
 
-    for task in manager.tasks:
-        task.update_status()
-        if task.id == task_id:
-            found = True
-            match task.lock_check():
-                case True:
-                    print("Task is locked.")
-                    return
-                case False:
-                    task.title = input("New title: ")
-                    task.description = input("New description: ")
-                    task.expiry_update = datetime.strptime(
-                        input("New expiry (YYYY-MM-DD HH:MM): "), "%Y-%m_%d %H:%M"
-                    )
-                    manager.save()
-                    print("Task updated.")
-                    return
+    match task:
+        case None:
+            print("Task ID not found.")
+            return
+        case _:
+            pass
 
-    match found:
+    task.update_status()
+    match task.lock_check():
+        case True:
+            print("Task is locked.")
         case False:
-            print("Task ID not found.")
+            task.title = input("New title: ")
+            task.description = input("New description: ")
+            task._title_lc = task.title.lower()
+            task._desc_lc = task.description.lower()
+            task.expiry_date = safe_datetime(
+                "New expiry (YYYY-MM-DD HH:MM): ")
+            task._status_dirty = True
+            manager.update_next_expiry()
+            manager._dirty = True
+            print("Task updated.")
 
 # ------------------------ complete bullet task ------------------------------
 
@@ -210,76 +345,77 @@ def complete_bullet(manager):
     # --------------- Get task ID safely --------------------
     while True:
         try:
-            task_id = int(input("Task ID: "))
+            task_id = int(read_line("Task ID: "))
             break
         except ValueError:
             print("please enter a valid ID number.")
 
 # --------------- Find task ---------------------
-        task = next((t for t in manager.tasks if t.id == task_id), None)
-        match task:
-            case None:
-                print(f"Task {task_id} not found")
-                return
-            case _:
-                pass
+    task = manager.by_id.get(task_id)
+    match task:
+        case None:
+            print(f"Task {task_id} not found")
+            return
+        case _:
+            pass
 
 # ------------- Lock check -------------------
-        match task.lock_check():
-            case True:
-                print(f"Task{task_id} is locked.")
-                return
-            case False:
-                pass
+    task.update_status()
+    match task.lock_check():
+        case True:
+            print(f"Task{task_id} is locked.")
+            return
+        case False:
+            pass
 
 # --------------- bullet existence check -------------------
-        match bool(task.bullets):
-            case False:
-                print("this task has no bullets to complete.")
-                return
-            case True:
-                pass
+    match bool(task.bullet_texts):
+        case False:
+            print("this task has no bullets to complete.")
+            return
+        case True:
+            pass
 
 # ----------------- Display bullets using WHILE loop ------------------------
-        print("\nBullets")
-        i = 0
-        while i < len(task.bullets):
-            b = task.bullets[i]
-            status = "complete" if b["done"] else "not complete"
-            print(f"{i + 1}. {b['text']} {status}")
-            i += 1
+    print("\nBullets")
+    i = 0
+    while i < len(task.bullet_texts):
+        status = "complete" if task.bullet_done[i] else "not complete"
+        print(f"{i + 1}. {task.bullet_texts[i]} {status}")
+        i += 1
 
 # ------------------- INTERACTIVE bullet selection ------------------------
-        attempts = 0
-        max_attempts = 3
+    attempts = 0
+    max_attempts = 3
 
-        while attempts < max_attempts:
-            try:
-                index = int(input("bullet number to mark done: ")) - 1
-            except ValueError:
+    while attempts < max_attempts:
+        try:
+            index = int(read_line("bullet number to mark done: ")) - 1
+        except ValueError:
+            attempts += 1
+            print(
+                f"invalid number. attempts left: {max_attempts - attempts}")
+            continue
+
+        match 0 <= index < len(task.bullet_texts):
+            case True:
+                match bool(task.bullet_done[index]):
+                    case True:
+                        print("bullet is alredy marked done")
+                    case False:
+                        task.bullet_done[index] = 1
+                        task._status_dirty = True
+                        task.update_status()
+                        manager._dirty = True
+                        print("bullet marked as done.")
+                break
+            case False:
                 attempts += 1
                 print(
-                    "invalid number. attempts left: {max_attempt - attempts}")
-                continue
-
-            match 0 <= index < len(task.bullets):
-                case True:
-                    match task.bullets[index]["done"]:
-                        case True:
-                            print("bullet is alredy marked done")
-                        case False:
-                            task.bullets[index]["done"] = True
-                            task.update_status()
-                            manager.save()
-                            print("bullet marked as done.")
-                    break
-                case False:
-                    attempts += 1
-                    print(
-                        f"bullet number out of range. attempts left: {max_attempts - attempts}")
+                    f"bullet number out of range. attempts left: {max_attempts - attempts}")
 
-        else:
-            print("too many invalid attempts. action cancelled")
+    else:
+        print("too many invalid attempts. action cancelled")
 
 # ------------------- view task ----------------------------
 
@@ -289,25 +425,33 @@ def view_tasks(manager):
         case[]:
             print("No tasks found.")
         case _:
+            now = datetime.now()
+            out = []
             for task in manager.tasks:
-                task.update_status()
-                print(f"\nID: {task.id}")
-                print(f"Title: {task.title}")
-                print(f"Description: {task.description}")
-                print(f"Expiry: {task.expiry_date.strftime('%Y-%m-%d %H:%M')}")
-                print(f"priority: {task.priority}")
-                print(f"status: {task.status}")
-                print(f"bullets: {task.bullets}")
-
-                if task.bullets:
+                task.update_status(now)
+                bullets = [
+                    {"text": text, "done": bool(done)}
+                    for text, done in zip(task.bullet_texts, task.bullet_done)
+                ]
+                out.append(
+                    f"\nID: {task.id}\n"
+                    f"Title: {task.title}\n"
+                    f"Description: {task.description}\n"
+                    f"Expiry: {task.expiry_date:%Y-%m-%d %H:%M}\n"
+                    f"priority: {task.priority}\n"
+                    f"status: {task.status}\n"
+                    f"bullets: {bullets}"
+                )
+
+                if task.bullet_texts:
                     i = 0
-                    while i < len(task.bullets):
-                        b = task.bullets[i]
-                        status = "complete" if b["done"] else "not complete"
-                        print(f"  {i + 1}. {b['text']} {status}")
+                    while i < len(task.bullet_texts):
+                        status = "complete" if task.bullet_done[i] else "not complete"
+                        out.append(f"  {i + 1}. {task.bullet_texts[i]} {status}")
                         i += 1
-                    else:
-                        print("No bullets")
+                else:
+                    out.append("No bullets")
+            sys.stdout.write("\n".join(out) + "\n")
 
 # ---------------------- search task --------------------------
 
@@ -316,7 +460,7 @@ def search(manager):
     keyword = input("search: ").lower()
     found = False
     for task in manager.tasks:
-        if keyword in task.title.lower() or keyword in task.description.lower():
+        if keyword in task._title_lc or keyword in task._desc_lc:
             print(f"{task.id}: {task.title} ({task.status})")
             found = True
     match found:
@@ -333,30 +477,33 @@ def delete_task(manager):
             return
         case _:
             task_id = int(input("Enter the Task ID to date: "))
-            i = 0
-            found = False
-            while i < len(manager.tasks):
-                task = manager.tasks[i]
-                if task.id == task_id:
-                    found = True
+            task = manager.by_id.get(task_id)
+            match task:
+                case None:
+                    print(f"Task ID {task_id} not found.")
+                case _:
                     match task.is_deletable():
                         case True:
-                            manager.tasks.pop(i)
-                            manager.save()
+                            manager.tasks.remove(task)
+                            del manager.by_id[task_id]
+                            manager.update_next_expiry()
+                            manager._dirty = True
                             print(f"Task {task_id} deleted.")
                         case False:
                             print(
                                 "Task can not be deleted yet (must be expired + 5 min).")
-                    break
-                i += 1
-            match found:
-                case False:
-                    print(f"Task ID {task_id} not found.")
 
 
 def cleanup(manager):
-    manager.tasks = [t for t in manager.tasks if not t.is_deletable()]
-    manager.save()
+    now = datetime.now()
+    if manager._next_expiry is None or now <= manager._next_expiry:
+        return
+    kept = [t for t in manager.tasks if not t.is_deletable(now)]
+    if len(kept) != len(manager.tasks):
+        manager.tasks = kept
+        manager.reindex()
+        manager._dirty = True
+    manager.update_next_expiry()
 
 # ------------------- Menu -----------------------------
 
@@ -377,6 +524,7 @@ def menu():
 
 def main():
     manager = TaskManager()
+    atexit.register(manager.flush)
 
     while True:
         cleanup(manager)
@@ -401,6 +549,8 @@ def main():
             case _:
                 print("invaild choice. please Enter 1-7.")
 
+        manager.flush()
+
 
 main()
 print("good bye")